@@ -65,13 +65,14 @@ class ErrorInGame(Exception):
 
 
 class ClusterManager:
-    def __init__(self, hosts, jobs, core_req_file=None):
+    def __init__(self, hosts, jobs, core_req_file=None, no_jobs=None):
         """Initialize a ClusterManager to run jobs in hosts
 
         Args:
             hosts (list[Host]): list of hosts in the cluster
-            jobs (list[Job]): list of jobs to execute in hosts
+            jobs (iterable[Job]): jobs to execute in hosts; may be a generator, consumed as jobs are dispatched
             core_req_file (list(str), optional): list of files to transfer to hosts. Defaults to None.
+            no_jobs (int, optional): number of jobs, required if jobs has no len(). Defaults to None.
         """
         self.hosts = hosts  
         self.jobs = jobs  
@@ -86,7 +87,7 @@ class ClusterManager:
         global no_failed_jobs
         global no_successful_jobs
 
-        no_total_jobs = len(self.jobs)
+        no_total_jobs = len(self.jobs) if no_jobs is None else no_jobs
         no_successful_jobs = 0
         no_failed_jobs = 0
         logging.info(f"########## ABOUT TO RUN {no_total_jobs} jobs in {len(hosts)} hosts ({total_no_workers} CPUs)")
@@ -121,29 +122,19 @@ class ClusterManager:
         results = (
             []
         )  # list of results: job.data, exit_code, result_out, result_err, job_secs_taken
-        while jobs_list:
+        while True:
+            failed_jobs = []    # jobs that failed in this round (to retry)
             results_run = Parallel(self.pool.qsize(), backend="threading")(
-                delayed(run_job)(self.pool, job) for job in jobs_list
+                delayed(run_job)(self.pool, job, failed_jobs) for job in jobs_list
             )
 
-            # Remove all failed games
-            while None in results_run:
-                results_run.remove(None)
-
-            games_failed = [    
-                job_data
-                for job_data, exit_code, _, _, _ in results_run
-                if exit_code == -1
-            ]
-            jobs_list = [
-                j for j in jobs_list if j.data in games_failed
-            ]  # extract failed jobs (to retry)
-            good_results = [
-                tuple(result) for result in results_run if not result[1] == -1
-            ]
-            results = (
-                results + good_results
-            )  # keep non-error results only (rest will be re-tried)
+            # keep non-error results only (rest will be re-tried); remove all failed games
+            results.extend(
+                tuple(result) for result in results_run if result is not None and not result[1] == -1
+            )
+            if not failed_jobs:
+                break
+            jobs_list = failed_jobs
 
         if len(time_games) > 0:
             avg_secs_game = round(sum(time_games) / len(time_games), 0)
@@ -221,7 +212,18 @@ def transfer_core_package(hostname, workers, required_files):
     return
 
 
-def run_job(pool, job):
+def run_job(pool, job, failed_jobs=None):
+    """Runs a job in the first free worker of the pool
+
+    Args:
+        pool (Queue[SSHClient]): pool of workers
+        job (Job): job to run
+        failed_jobs (list[Job], optional): if given, the job is appended to it when it fails to run. Defaults to None.
+
+    Returns:
+        tuple: (job.data, exit_code, result_out, result_err, job_secs_taken), exit_code being -1 if the job failed,
+            or None if the job could not be run at all
+    """
     global no_successful_jobs
     global no_failed_jobs
     global no_total_jobs
@@ -300,6 +302,8 @@ def run_job(pool, job):
     )
 
     pool.put(worker)
+    if failed_jobs is not None and result_job_on_worker is not None and result_job_on_worker[1] == -1:
+        failed_jobs.append(job)
     return result_job_on_worker
 
 
@@ -329,9 +333,10 @@ def _rmdir(sftp, path):
 def run_job_on_worker(worker, job):
     global max_secs_game
 
-    # create remote env
-    instance_id = "{}-{}".format(
-        job.id.replace(" ", "_"), datetime.datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+    # create remote env: a folder of its own for each run of the job, where the game writes its replay and log
+    #   (the random suffix keeps a job retried within the same second away from the folder of the failed run)
+    instance_id = "{}-{}-{}".format(
+        job.id.replace(" ", "_"), datetime.datetime.now().strftime("%Y-%m-%d-%H-%M-%S"), os.urandom(4).hex()
     )
     dest_dir = f"/tmp/cluster_instance_{instance_id}"
     
@@ -1,6 +1,7 @@
 import os
 import re
 import sys
+import zipfile
 from pytz import timezone
 
 DIR_SCRIPT = sys.path[0]
@@ -43,4 +44,8 @@ DEFAULT_RANDOM_LAYOUTS = 3
 
 DEFAULT_NO_SPLIT = 1
 
+# zip compression methods available for the core package (must be supported by unzip in the hosts)
+CORE_PACKAGE_COMPRESSIONS = {"stored": zipfile.ZIP_STORED, "deflated": zipfile.ZIP_DEFLATED}
+DEFAULT_CORE_PACKAGE_COMPRESSION = "stored"  # no compression: transferred once per host over fast networks
+
 LOG_HEADER_MARK = "##########"
\ No newline at end of file
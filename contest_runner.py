@@ -3,17 +3,77 @@ import sys
 import re
 import shutil
 import zipfile
-import glob
 import tarfile
+import gzip
 import subprocess
 import json
-from itertools import combinations
+from itertools import combinations, product
 import logging
 from config import *
 import random
+import numpy as np
+from contextlib import contextmanager
+from joblib import Parallel, delayed
 
 from cluster_manager import ClusterManager, Job, Host, TransferableFile
 
+# Outcome lines reported by capture.py in a game log; scanned in one pass by ContestRunner._parse_result()
+GAME_OUTCOME_PATTERN = re.compile(
+    r"(?P<win>(?P<win_side>Red|Blue)[^\n]*?wins by\s*(?P<win_score>[-+]?\d+)\s*points)"
+    r"|(?P<returned>The (?P<returned_side>Red|Blue) team has returned at least (?P<returned_score>[-+]?\d+))"
+    r"|(?P<tie>Tie [Gg]ame)"
+    r"|(?P<total_time>Total Time Game: (?P<total_time_secs>[^ \n]*))"
+)
+
+# Signs of a game log that one or both teams crashed or failed to load, checked by ContestRunner._parse_result()
+#   before looking for the outcome (the specific Red/Blue crash alternatives go before the generic one)
+GAME_CRASH_PATTERN = re.compile(
+    r"(?P<traceback>Traceback)"
+    r"|(?P<red_crashed>Red agent crashed)|(?P<blue_crashed>Blue agent crashed)|(?P<crashed>agent crashed)"
+    r"|(?P<red_not_loaded>Red team failed to load!)|(?P<blue_not_loaded>Blue team failed to load!)"
+    r"|(?P<red_load_error>redAgents = loadAgents)|(?P<blue_load_error>blueAgents = loadAgents)"
+)
+
+# Compression of the logs/replays archives: low gzip level (most of the size reduction, a fraction of the CPU time)
+#   and large blocks when streaming the tar
+TAR_GZ_COMPRESS_LEVEL = 1
+TAR_STREAM_BUFSIZE = 1024 * 1024
+
+# Number of worker processes used to read and parse game logs when analysing the outputs of a contest
+NO_ANALYSIS_PROCESSES = os.cpu_count() or 1
+
+
+@contextmanager
+def open_tar_gz(archive_path, use_pigz=True):
+    """Opens a tar.gz archive for writing, as a stream with large blocks and fast (level TAR_GZ_COMPRESS_LEVEL)
+    compression. If pigz is available (and use_pigz), compression is done by it (using all cores) by streaming the
+    tar into it; otherwise, it falls back to Python own (single-core) gzip compression.
+
+    Args:
+        archive_path (str): the .tar.gz file to create
+        use_pigz (bool, optional): False to always compress in-process (e.g., for small archives, where starting
+            pigz would cost more than it saves). Defaults to True.
+
+    Yields:
+        tarfile.TarFile: the archive open for writing
+    """
+    pigz = shutil.which("pigz") if use_pigz else None
+    if pigz is None:
+        with gzip.GzipFile(archive_path, "wb", compresslevel=TAR_GZ_COMPRESS_LEVEL) as gz_out:
+            with tarfile.open(fileobj=gz_out, mode="w|", bufsize=TAR_STREAM_BUFSIZE) as tar:
+                yield tar
+        return
+
+    with open(archive_path, "wb") as f_out:
+        pigz_proc = subprocess.Popen([pigz, "-c", f"-{TAR_GZ_COMPRESS_LEVEL}"], stdin=subprocess.PIPE, stdout=f_out)
+        try:
+            with tarfile.open(fileobj=pigz_proc.stdin, mode="w|", bufsize=TAR_STREAM_BUFSIZE) as tar:
+                yield tar
+        finally:
+            pigz_proc.stdin.close()
+            if pigz_proc.wait() != 0:
+                raise subprocess.CalledProcessError(pigz_proc.returncode, pigz)
+
 class ContestRunner:
     """Class representing one Capture the Flag contest with a set of teams in a set of layouts
 
@@ -80,10 +140,31 @@ class ContestRunner:
             shutil.rmtree(self.tmp_logs_dir)
         os.makedirs(self.tmp_logs_dir)
 
-        self.ladder = {n: [] for n, _ in self.all_teams}
+        # Parts of the job of each game that are the same for all games (see _generate_job())
+        #   expand the core package into the contest folder (quietly, as the output of each job is kept in memory
+        #   until the end of the contest), and then run the game from within it
+        self.job_command_prefix = "mkdir -p {contest_dir} ; unzip -q -o {zip_file} -d {contest_dir} ; chmod +x -R * ; cd {contest_dir} ; ".format(
+            zip_file=os.path.join("/tmp", CORE_CONTEST_TEAM_ZIP_FILE),
+            contest_dir=self.tmp_dir,
+        )
+        self.job_command_suffix = " ; touch replay-0"
+        # the game command with the options fixed for the whole contest already in (see _get_game_command())
+        self.game_command_template = (
+            'python3 capture.py -c -q --record --recordLog --delay 0.0 --fixRandomSeed'
+            f' -r "{{red}}" -b "{{blue}}" -l {{layout}} -i {self.max_steps}'
+        )
+        self.job_replay_remote_path = os.path.join(self.tmp_dir, "replay-0")
+        self.job_log_remote_path = os.path.join(self.tmp_dir, "log-0")
+
+        # per-team data is kept by team index (position in self.all_teams): the ladder as two parallel lists with
+        #   one entry per team per game (team index and score for that team), and the errors as one count per team
+        team_names = [n for n, _ in self.all_teams]
+        self.team_index = {n: i for i, n in enumerate(team_names)}
+        self.ladder_teams = []
+        self.ladder_scores = []
         self.games = []
-        self.errors = {n: 0 for n, _ in self.all_teams}
-        self.team_stats = {n: 0 for n, _ in self.all_teams}
+        self.errors = np.zeros(len(team_names), dtype=np.int64)
+        self.team_stats = dict.fromkeys(team_names, 0)
 
 
     def _generate_job(self, red_team, blue_team, layout):
@@ -100,40 +181,16 @@ class ContestRunner:
         blue_team_name, _ = blue_team
 
         game_command = self._get_game_command(red_team, blue_team, layout)
+        command = "".join((self.job_command_prefix, game_command, self.job_command_suffix))
 
-        deflate_command = "mkdir -p {contest_dir} ; unzip -o {zip_file} -d {contest_dir} ; chmod +x -R *".format(
-            zip_file=os.path.join("/tmp", CORE_CONTEST_TEAM_ZIP_FILE),
-            contest_dir=self.tmp_dir,
-        )
-
-        command = "{deflate_command} ; cd {contest_dir} ; {game_command} ; touch {replay_filename}".format(
-            deflate_command=deflate_command,
-            contest_dir=self.tmp_dir,
-            game_command=game_command,
-            replay_filename="replay-0",
-        )
-
-        replay_file_name = "{red_team_name}_vs_{blue_team_name}_{layout}.replay".format(
-            layout=layout,
-            run_id=self.contest_timestamp_id,
-            red_team_name=red_team_name,
-            blue_team_name=blue_team_name,
-        )
-
-        log_file_name = "{red_team_name}_vs_{blue_team_name}_{layout}.log".format(
-            layout=layout,
-            run_id=self.contest_timestamp_id,
-            red_team_name=red_team_name,
-            blue_team_name=blue_team_name,
-        )
-
+        game_name = f"{red_team_name}_vs_{blue_team_name}_{layout}"
         ret_file_replay = TransferableFile(
-            local_path=os.path.join(self.tmp_replays_dir, replay_file_name),
-            remote_path=os.path.join(self.tmp_dir, "replay-0"),
+            local_path=os.path.join(self.tmp_replays_dir, f"{game_name}.replay"),
+            remote_path=self.job_replay_remote_path,
         )
         ret_file_log = TransferableFile(
-            local_path=os.path.join(self.tmp_logs_dir, log_file_name),
-            remote_path=os.path.join(self.tmp_dir, "log-0"),
+            local_path=os.path.join(self.tmp_logs_dir, f"{game_name}.log"),
+            remote_path=self.job_log_remote_path,
         )
 
         return Job(
@@ -175,53 +232,67 @@ class ContestRunner:
         (red_team_name, red_team_path_file) = red_team
         (blue_team_name, blue_team_path_file) = blue_team
 
-        cmd = f'python3 capture.py -c -q --record --recordLog --delay 0.0 --fixRandomSeed'
-        cmd = cmd + " " + f'-r "{red_team_path_file}" -b "{blue_team_path_file}" -l {layout} -i {self.max_steps}'
-
-        return cmd
+        return self.game_command_template.format(red=red_team_path_file, blue=blue_team_path_file, layout=layout)
 
     def _analyse_all_outputs(self, games_results):
         logging.info(
             f"About to analyze game result outputs. Number of result output to analyze: {len(games_results)}")
-        for result in games_results:
+
+        # reading and parsing each log is independent (and mostly CPU bound), so do it in worker processes;
+        #   the outcomes are then folded in serially into the ladder, self.errors and self.games
+        outcomes = Parallel(NO_ANALYSIS_PROCESSES)(
+            delayed(ContestRunner._analyse_game_log)(
+                os.path.join(self.tmp_logs_dir, f"{red_team[0]}_vs_{blue_team[0]}_{layout}.log"),
+                red_team[0], blue_team[0], layout
+            )
+            for (red_team, blue_team, layout), _, _, _, _ in games_results
+        )
+        for result, outcome in zip(games_results, outcomes):
             (red_team, blue_team, layout), exit_code, output, error, time_taken = result
             if exit_code != 0:
                 print(f"Game {red_team[0]} vs {blue_team[0]} in {layout} exited with error code {exit_code}")
-            self._analyse_game_output(
-                red_team, blue_team, layout, exit_code, time_taken
-            )
+            self._add_game_outcome(red_team, blue_team, layout, outcome)
 
-    def _analyse_game_output(self, red_team, blue_team, layout, exit_code, total_secs_taken):
+    @staticmethod
+    def _analyse_game_log(log_file_path, red_team_name, blue_team_name, layout):
+        """Reads and parses the log of a game (run in a worker process, so it does not touch the contest state,
+        and it does not log either: the errors found are returned to be logged by _add_game_outcome())
+
+        Returns:
+            tuple: the outcome of the game, as returned by _parse_result()
         """
-        Analyzes the output of a match from the log file and adds the following tuple to self.games:
+        read_errors = ()
+        with open(log_file_path, "r") as f:
+            try:
+                log_output = f.read()
+            except:
+                read_errors = (f"Unable to read log file {os.path.basename(log_file_path)}",)
+                log_output = ""
+
+        *outcome, error_messages = ContestRunner._parse_result(log_output, red_team_name, blue_team_name, layout)
+        return (*outcome, read_errors + error_messages)
+
+    def _add_game_outcome(self, red_team, blue_team, layout, outcome):
+        """
+        Adds the parsed outcome of a match to the ladder and errors of its teams, and the following tuple to self.games:
         
             (read_team, blue_team, layout, score, winner, time)
         """
         red_team_name, _ = red_team
         blue_team_name, _ = blue_team
 
-        # dump the log of the game into file for the game: red vs blue in layout
-        log_file_name = f"{red_team_name}_vs_{blue_team_name}_{layout}.log"
-
-        # read log text from log file
-        with open(os.path.join(self.tmp_logs_dir, log_file_name), "r") as f:
-            try:
-                log_output = f.read()
-            except:
-                logging.error(f"Unable to read log file {log_file_name}")
-                log_output = ""
-
-        # now parse the output to get all the info: winner, etc
-        score, winner, loser, bug, total_time = self._parse_result(
-            log_output, red_team_name, blue_team_name, layout
-        )
+        score, winner, loser, bug, total_time, failed_teams, error_messages = outcome
+        for error_message in error_messages:
+            logging.error(error_message)
+        for team_name in failed_teams:
+            self.errors[self.team_index[team_name]] += 1
 
         if winner is None:
-            self.ladder[red_team_name].append(score)
-            self.ladder[blue_team_name].append(score)
+            self.ladder_teams += (self.team_index[red_team_name], self.team_index[blue_team_name])
+            self.ladder_scores += (score, score)
         else:
-            self.ladder[winner].append(score)
-            self.ladder[loser].append(-score)
+            self.ladder_teams += (self.team_index[winner], self.team_index[loser])
+            self.ladder_scores += (score, -score)
 
         if bug:
             score = ERROR_SCORE
@@ -229,14 +300,16 @@ class ContestRunner:
         # Append match game outcome to self.games
         self.games.append((red_team_name, blue_team_name, layout, score, winner, total_time))
 
-    def _parse_result(self, output, red_team_name, blue_team_name, layout):
+    @staticmethod
+    def _parse_result(output, red_team_name, blue_team_name, layout):
         """
         Parses the result log of a match to extract outcome.
 
         :param output: an iterator of the lines of the result log
         :param red_team_name: name of Red team
         :param blue_team_name: name of Blue team
-        :return: a tuple containing score, winner, loser and a flag signaling whether there was a bug
+        :return: a tuple containing score, winner, loser, a flag signaling whether there was a bug, the total time
+            of the game, the names of the teams that failed (to be counted as errors), and the error messages to log
         """
         score = 0
         winner = None
@@ -244,125 +317,109 @@ class ContestRunner:
         bug = False
         tied = False
         total_time = 0
+        failed_teams = ()
+        error_messages = ()
 
         try:
             output = output.decode()  # convert byte into string
         except:
             pass  # it is already a string
 
-        if output.find("Traceback") != -1 or output.find("agent crashed") != -1:
+        crash_signs = {match.lastgroup for match in GAME_CRASH_PATTERN.finditer(output)}
+        if crash_signs & {"traceback", "red_crashed", "blue_crashed", "crashed"}:
             bug = True
             # if both teams fail to load, no one wins
-            if (
-                output.find("Red team failed to load!") != -1
-                and output.find("Blue team failed to load!") != -1
-            ):
-                self.errors[red_team_name] += 1
-                self.errors[blue_team_name] += 1
+            if {"red_not_loaded", "blue_not_loaded"} <= crash_signs:
+                failed_teams = (red_team_name, blue_team_name)
                 winner = None
                 loser = None
                 score = ERROR_SCORE
-            elif (
-                output.find("Red agent crashed") != -1
-                or output.find("redAgents = loadAgents") != -1
-                or output.find("Red team failed to load!") != -1
-            ):
-                self.errors[red_team_name] += 1
+            elif crash_signs & {"red_crashed", "red_load_error", "red_not_loaded"}:
+                failed_teams = (red_team_name,)
                 winner = blue_team_name
                 loser = red_team_name
                 score = 1
-            elif (
-                output.find("Blue agent crashed") != -1
-                or output.find("blueAgents = loadAgents") != -1
-                or output.find("Blue team failed to load!")
-            ):
-                self.errors[blue_team_name] += 1
+            elif crash_signs & {"blue_crashed", "blue_load_error", "blue_not_loaded"}:
+                failed_teams = (blue_team_name,)
                 winner = red_team_name
                 loser = blue_team_name
                 score = 1
             else:
-                logging.error(
+                # the game crashed but it is not clear which team caused it: leave it out of the standings
+                winner = None
+                loser = None
+                score = ERROR_SCORE
+                error_messages = (
                     "Note able to parse out for game {} vs {} in {} (traceback available, but couldn't get winner!)".format(
                         red_team_name, blue_team_name, layout
-                    )
+                    ),
                 )
         else:
-            for line in output.splitlines():
-                if line.find("wins by") != -1:
-                    score = abs(
-                        int(line.split("wins by")[1].split("points")[0]))
-                    if line.find("Red") != -1:
+            for match in GAME_OUTCOME_PATTERN.finditer(output):
+                outcome = match.lastgroup
+                if outcome == "win":
+                    score = abs(int(match.group("win_score")))
+                    if match.group("win_side") == "Red":
                         winner = red_team_name
                         loser = blue_team_name
-                    elif line.find("Blue") != -1:
+                    else:
                         winner = blue_team_name
                         loser = red_team_name
-                if line.find("The Blue team has returned at least ") != -1:
-                    score = abs(
-                        int(
-                            line.split("The Blue team has returned at least ")[1].split(
-                                " "
-                            )[0]
-                        )
-                    )
-                    winner = blue_team_name
-                    loser = red_team_name
-                elif line.find("The Red team has returned at least ") != -1:
-                    score = abs(
-                        int(
-                            line.split("The Red team has returned at least ")[1].split(
-                                " "
-                            )[0]
-                        )
-                    )
-                    winner = red_team_name
-                    loser = blue_team_name
-                elif line.find("Tie Game") != -1 or line.find("Tie game") != -1:
+                elif outcome == "returned":
+                    score = abs(int(match.group("returned_score")))
+                    if match.group("returned_side") == "Blue":
+                        winner = blue_team_name
+                        loser = red_team_name
+                    else:
+                        winner = red_team_name
+                        loser = blue_team_name
+                elif outcome == "tie":
                     winner = None
                     loser = None
                     tied = True
-
-                if line.find("Total Time Game: ") != -1:
-                    total_time = int(
-                        float(line.split("Total Time Game: ")[1].split(" ")[0])
-                    )
+                elif outcome == "total_time":
+                    total_time = int(float(match.group("total_time_secs")))
 
             # signal strange case where script was unable to find outcome of game - should never happen!
             if winner is None and loser is None and not tied:
-                logging.error(
-                    f"Note able to successfully parse output for game {red_team_name} vs {blue_team_name} in {layout}: \n {output} \n =====================================")
+                error_messages = (
+                    f"Note able to successfully parse output for game {red_team_name} vs {blue_team_name} in {layout}: \n {output} \n =====================================",
+                )
                 winner = None
                 loser = None
                 tied = True
                 score = -1
                 # sys.exit(1)
 
-        return score, winner, loser, bug, total_time
+        return score, winner, loser, bug, total_time, failed_teams, error_messages
 
     def _calculate_team_stats(self):
         """
         From each individual game, compute stats per team (% won, points, wins, etc.) and store it in self.team_stats
         """
+        # count the outcomes of all teams at once, binning the ladder by team (games that errored are not counted)
+        no_teams = len(self.team_index)
+        teams = np.array(self.ladder_teams, dtype=np.intp)
+        scores = np.array(self.ladder_scores, dtype=np.int64)
+        counted = scores != ERROR_SCORE
+        teams = teams[counted]
+        scores = scores[counted]
+        all_wins = np.bincount(teams[scores > 0], minlength=no_teams)
+        all_draws = np.bincount(teams[scores == 0], minlength=no_teams)
+        all_loses = np.bincount(teams[scores < 0], minlength=no_teams)
+        all_sum_scores = np.zeros(no_teams, dtype=np.int64)
+        np.add.at(all_sum_scores, teams, scores)
+
         staff_team_names = [t[0] for t in self.staff_teams]
-        for team, scores in self.ladder.items():
+        for team, i in self.team_index.items():
             if self.hide_staff_teams and team in staff_team_names:
                 # remove staff team from dictionary.
                 self.team_stats.pop(team, None)
                 continue
-            wins = 0
-            draws = 0
-            loses = 0
-            sum_score = 0
-            for s in scores:
-                if s == ERROR_SCORE:
-                    continue
-                if s > 0:
-                    wins += 1
-                elif s == 0:
-                    draws += 1
-                else:
-                    loses += 1
-                sum_score += s
+            wins = int(all_wins[i])
+            draws = int(all_draws[i])
+            loses = int(all_loses[i])
+            sum_score = int(all_sum_scores[i])
 
             points = (wins * 3) + draws
             self.team_stats[team] = [
@@ -371,7 +428,7 @@ class ContestRunner:
                 wins,
                 draws,
                 loses,
-                self.errors[team],
+                int(self.errors[i]),
                 sum_score,
             ]
 
@@ -400,16 +457,16 @@ class ContestRunner:
 
         logging.info(f"Transferring {file_name} to transfer.sh service...")
 
-        transfer_cmd = f"curl --upload-file {file_full_path} https://transfer.sh/{remote_name}"
+        transfer_cmd = ["curl", "--upload-file", file_full_path, f"https://transfer.sh/{remote_name}"]
         try:
             # This will yield a byte, not a str (at least in Python 3)
-            transfer_url = subprocess.check_output(transfer_cmd, shell=True)
-            if "Could not save metadata" in transfer_url:
+            transfer_url = subprocess.check_output(transfer_cmd)
+            if b"Could not save metadata" in transfer_url:
                 raise ValueError(
                     f"Transfer.sh returns incorrect url: {transfer_url}")
             if remove_local:
                 print("rm %s" % file_full_path)
-                os.system("rm %s" % file_full_path)
+                os.remove(file_full_path)
                 transfer_url = transfer_url.decode()  # convert to string
             logging.info(
                 f"File {file_name} transferred successfully to transfer.sh service; URL: {transfer_url}"
@@ -464,7 +521,7 @@ class ContestRunner:
 
         # Second, make a tar.gz file with all replays (optionally upload it to transfer.sh)
         replays_archive = os.path.join(self.replays_www_dir, f"replays_{self.contest_timestamp_id}.tar.gz")
-        with tarfile.open(replays_archive, "w:gz") as tar:
+        with open_tar_gz(replays_archive) as tar:
             tar.add(replays_folder, arcname="/")
         
         # rel path to WWW dir of compressed replay file to use for linking it in WWW
@@ -481,11 +538,14 @@ class ContestRunner:
             except Exception as e:
                 logging.error(f"Exception when uploading replay file {os.path.split(replays_archive)[-1]}: {e}")
 
-        # Third, create replay compress archives for each team
+        # Third, create replay compress archives for each team (small, so compressed in-process rather than by pigz)
+        # list the replays once, rather than globbing the (large) folder for each team
+        with os.scandir(replays_folder) as entries:
+            replay_files = [(e.name, e.path) for e in entries if not e.name.startswith(".")]
         for team_name in self.team_stats.keys():
             replays_team_archive = os.path.join(self.replays_www_dir, f'replays_{self.contest_timestamp_id}', f'replays_{team_name}.tar.gz')
-            replay_files_to_pack = glob.glob(os.path.join(replays_folder, f"*{team_name}*"))
-            with tarfile.open(replays_team_archive, "w:gz") as tar:
+            replay_files_to_pack = [path for name, path in replay_files if team_name in name]
+            with open_tar_gz(replays_team_archive, use_pigz=False) as tar:
                 for replay_file in replay_files_to_pack:
                     tar.add(replay_file, arcname="/")
 
@@ -508,7 +568,7 @@ class ContestRunner:
 
         # Second, build a full compressed file with all logs that have been copied across (may be very large!)
         logs_archive = os.path.join(self.logs_www_dir, f"logs_{self.contest_timestamp_id}.tar.gz")
-        with tarfile.open(logs_archive, "w:gz") as tar:
+        with open_tar_gz(logs_archive) as tar:
             tar.add(logs_folder, arcname="/")
 
         # rel path to WWW dir of compressed replay file to use for linking it in WWW
@@ -525,12 +585,15 @@ class ContestRunner:
             except Exception as e:
                 logging.error(f"Exception when uploading log file {os.path.split(logs_archive)[-1]}: {e}")
 
-        # Third, create tar.gz log archives for each team
+        # Third, create tar.gz log archives for each team (small, so compressed in-process rather than by pigz)
         # store the files without the folders
+        # list the logs once, rather than globbing the (large) folder for each team
+        with os.scandir(logs_folder) as entries:
+            log_files = [(e.name, e.path) for e in entries if not e.name.startswith(".")]
         for team_name in self.team_stats.keys():
             logs_team_archive = os.path.join(self.logs_www_dir, f'logs_{self.contest_timestamp_id}', f'logs_{team_name}.tar.gz')
-            logs_files_to_pack = glob.glob(os.path.join(logs_folder, f"*{team_name}*"))
-            with tarfile.open(logs_team_archive, "w:gz") as tar:
+            logs_files_to_pack = [path for name, path in log_files if team_name in name]
+            with open_tar_gz(logs_team_archive, use_pigz=False) as tar:
                 for log_file in logs_files_to_pack:
                     tar.add(log_file, arcname="/")
 
@@ -544,13 +607,14 @@ class ContestRunner:
         ################################
         stats_file_full_path = os.path.join(self.stats_www_dir, f"stats_{self.contest_timestamp_id}.json")
         with open(stats_file_full_path, "w") as f:
-            json.dump(contest_stats, f)
+            # dumps() in one go uses the C encoder; dump() would encode (and write) it piece by piece in Python
+            f.write(json.dumps(contest_stats))
         # rel link to use in WWW
         stats_file_link = os.path.relpath(stats_file_full_path, self.www_dir)
         
         config_file_full_path = os.path.join(self.config_www_dir, f"config_{self.contest_timestamp_id}.json")
         with open(config_file_full_path, "w") as f:
-            json.dump(self.config, f, sort_keys=True, indent=4, separators=(",", ": "))
+            f.write(json.dumps(self.config, sort_keys=True, indent=4, separators=(",", ": ")))
         # rel link to use in WWW
         config_file_link = os.path.relpath(config_file_full_path, self.www_dir)
 
@@ -570,7 +634,7 @@ class ContestRunner:
         """This is the MAIN API function to actually run a single contest in a cluster.
         Notice that a Multi-contest is a set of contests.
 
-        1. First, build a (huge) list of Jobs that must be run, one per game.
+        1. First, generate the (many) Jobs that must be run, one per game; built lazily unless resuming.
         2. Creates and runs a ClusterManager with that jobs
         3. Process outputs and build stats
 
@@ -603,15 +667,18 @@ class ContestRunner:
                 os.path.join(
                     resume_folder, "replays-run"), self.tmp_replays_dir
             )
-            jobs = self._generate_contest_jobs(resume=True)
+            jobs = list(self._generate_contest_jobs(resume=True))
+            no_jobs = len(jobs)
 
             # when we resume we ask for confirmation before starting...
             if input("Enter 'Yes' to continue; anything else to abort: ") != "Yes":
                      logging.error("Aborting contest...")
                      exit(1)
         else:
+            # jobs are built lazily, as the cluster manager dispatches them
             jobs = self._generate_contest_jobs(resume=False)
-            
+            no_jobs = self._no_contest_games()
+
  
         # Create ClusterManager to run jobs in hosts and start it to run all jobs
         # Variable results will contain ALL outputs from every game played, to be analyzed then
@@ -622,7 +689,7 @@ class ContestRunner:
                 local_path=os.path.join(TMP_DIR, CORE_CONTEST_TEAM_ZIP_FILE),
                 remote_path=os.path.join("/tmp", CORE_CONTEST_TEAM_ZIP_FILE),
             )]
-        cm = ClusterManager(hosts, jobs, core_req_files)
+        cm = ClusterManager(hosts, jobs, core_req_files, no_jobs)
         results, no_successful_job, avg_time, max_time = cm.start()
 
         # results is list of (job.data, exit_code, result_out, result_err, job_secs_taken)
@@ -633,71 +700,86 @@ class ContestRunner:
         self._analyse_all_outputs(results)
         self._calculate_team_stats()
 
+    def _no_contest_games(self):
+        """Number of games to be played in the contest (i.e., number of jobs generated by _generate_contest_jobs())"""
+        if self.staff_teams_vs_others_only:
+            return len(self.teams) * len(self.staff_teams) * len(self.layouts)
+        no_teams = len(self.all_teams)
+        return (no_teams * (no_teams - 1) // 2) * len(self.layouts)
+
+    def _list_restored_logs(self):
+        """List the game logs restored from a previous run into the temporary logs folder
+
+        Returns:
+            dict: file name of each log mapped to its size in bytes
+        """
+        with os.scandir(self.tmp_logs_dir) as entries:
+            return {entry.name: entry.stat().st_size for entry in entries if entry.is_file()}
+
     def _generate_contest_jobs(self, resume=False):
-        """Generate a list of Jobs for the games to play
+        """Generate the Jobs for the games to play, lazily (one at a time, as they are consumed)
         Uses _generate_empty_job() and _generate_job() to build an actual Job
 
         Args:
             resume (bool, optional): True if we are resuming a previous contest and some logs have been copied across already. Defaults to False.
-        Returns:
-            [list(Jobs)]: list of all jobs to run, each being a game
+        Yields:
+            Job: the next job to run, each being a game
         """
-        jobs = []
+        no_jobs = 0
         games_restored = 0
+        # size of the logs restored from the previous run, listed once instead of checking every possible game
+        restored_logs = self._list_restored_logs() if resume else {}
         if self.staff_teams_vs_others_only:
-            for team in self.teams:
-                for staff in self.staff_teams:
-                    for layout in self.layouts:
-                        # remember red_team = (name of team, path of file)
-                        # when playing staff teams only, team always plays red
-                        log_file_name2 = f"{staff[0]}_vs_{team[0]}_{layout}.log"
-                        if resume:  # if game between these two in layout exist, then skip and recover it
-                            log_file_name1 = os.path.join(self.tmp_logs_dir, f"{team[0]}_vs_{staff[0]}_{layout}.log")
-                            log_file_name2 = os.path.join(self.tmp_logs_dir, f"{staff[0]}_vs_{team[0]}_{layout}.log")
-                            if os.path.isfile(log_file_name1) and os.stat(log_file_name1).st_size != 0:
-                                games_restored += 1
-                                print(f"Game {log_file_name1} restored (total restored: {games_restored})")
-                                jobs.append(self._generate_empty_job(team, staff, layout))
-                                continue
-                            elif os.path.isfile(log_file_name2) and os.stat(log_file_name2).st_size != 0:
-                                games_restored += 1
-                                print(f"Game {log_file_name2} restored (total restored: {games_restored})")
-                                jobs.append(self._generate_empty_job(staff, team, layout))
-                                continue
-                        
-                        if random.randrange(2) == 0:    
-                            red_team = team
-                            blue_team = staff
-                        else:
-                            red_team = staff
-                            blue_team = team
-
-                        # either not resume anything or log file does not exist
-                        jobs.append(self._generate_job(
-                            red_team, blue_team, layout))
-        else:
-            for red_team, blue_team in combinations(self.all_teams, r=2):
-                for layout in self.layouts:
-                    # remember red_team = (name of team, path of file)
-                    log_file_name = f"{red_team[0]}_vs_{blue_team[0]}_{layout}.log"
-                    if resume and os.path.isfile(os.path.join(self.tmp_logs_dir, log_file_name)):
+            for team, staff, layout in product(self.teams, self.staff_teams, self.layouts):
+                # remember red_team = (name of team, path of file)
+                # when playing staff teams only, team always plays red
+                log_file_name2 = f"{staff[0]}_vs_{team[0]}_{layout}.log"
+                if resume:  # if game between these two in layout exist, then skip and recover it
+                    log_file_name1 = f"{team[0]}_vs_{staff[0]}_{layout}.log"
+                    if restored_logs.get(log_file_name1, 0) != 0:
                         games_restored += 1
-                        print(f"{games_restored} Game {log_file_name} restored")
-                        jobs.append(self._generate_empty_job(
-                            red_team, blue_team, layout))
+                        print(f"Game {os.path.join(self.tmp_logs_dir, log_file_name1)} restored (total restored: {games_restored})")
+                        no_jobs += 1
+                        yield self._generate_empty_job(team, staff, layout)
                         continue
-                    log_file_name = f"{blue_team[0]}_vs_{red_team[0]}_{layout}.log"
-                    if resume and os.path.isfile(os.path.join(self.tmp_logs_dir, log_file_name)):
+                    elif restored_logs.get(log_file_name2, 0) != 0:
                         games_restored += 1
-                        print(f"{games_restored} Game {log_file_name} restored")
-                        jobs.append(self._generate_empty_job(
-                            blue_team, red_team, layout))
+                        print(f"Game {os.path.join(self.tmp_logs_dir, log_file_name2)} restored (total restored: {games_restored})")
+                        no_jobs += 1
+                        yield self._generate_empty_job(staff, team, layout)
                         continue
+                        
+                if random.randrange(2) == 0:    
+                    red_team = team
+                    blue_team = staff
+                else:
+                    red_team = staff
+                    blue_team = team
+
+                # either not resume anything or log file does not exist
+                no_jobs += 1
+                yield self._generate_job(red_team, blue_team, layout)
+        else:
+            for (red_team, blue_team), layout in product(combinations(self.all_teams, r=2), self.layouts):
+                # remember red_team = (name of team, path of file)
+                log_file_name = f"{red_team[0]}_vs_{blue_team[0]}_{layout}.log"
+                if log_file_name in restored_logs:
+                    games_restored += 1
+                    print(f"{games_restored} Game {log_file_name} restored")
+                    no_jobs += 1
+                    yield self._generate_empty_job(red_team, blue_team, layout)
+                    continue
+                log_file_name = f"{blue_team[0]}_vs_{red_team[0]}_{layout}.log"
+                if log_file_name in restored_logs:
+                    games_restored += 1
+                    print(f"{games_restored} Game {log_file_name} restored")
+                    no_jobs += 1
+                    yield self._generate_empty_job(blue_team, red_team, layout)
+                    continue
 
-                    # either not resume anything or log file does not exist
-                    jobs.append(self._generate_job(
-                        red_team, blue_team, layout))
+                # either not resume anything or log file does not exist
+                no_jobs += 1
+                yield self._generate_job(red_team, blue_team, layout)
         if games_restored > 0:
             print(
-                f'A total of {games_restored} games have been restored. Missing: {len(jobs)-games_restored}', flush=True)
-        return jobs
+                f'A total of {games_restored} games have been restored. Missing: {no_jobs-games_restored}', flush=True)
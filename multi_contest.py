@@ -6,13 +6,41 @@ import iso8601
 import csv
 import datetime
 import json
+import hashlib
 import logging
+import threading
 
 from string import ascii_lowercase
+from joblib import Parallel, delayed
 
 from config import *
 from contest_runner import ContestRunner
 
+# files/folders in a team submission folder that are not part of the team (not copied nor transferred)
+TEAM_IGNORE_PATTERNS = shutil.ignore_patterns(
+    '.git', '*.log', '*.replay', '*.gz', '*img*', '*layouts*', '*wiki*')
+
+# buffer size used when copying file contents into/out of zip files
+COPY_BUFSIZE = 2 * 1024 * 1024
+
+# version of how the core package is built: bump it whenever that changes, so packages built before are not re-used
+CORE_PACKAGE_FORMAT_VERSION = 2
+
+# prefix of the folders being removed in the background (renamed so they are out of the way straight away)
+TRASH_DIR_PREFIX = ".trash-"
+
+# file inside the expanded platform folder with the hash of the zip files it was expanded from
+PLATFORM_HASH_FILE = ".platform.hash"
+
+# extension of the layout files in the layouts zip file
+LAYOUT_FILE_EXTENSION = ".lay"
+
+# name of a random layout, with its seed
+RANDOM_LAYOUT_PATTERN = re.compile(r"RANDOM([0-9]*)")
+
+# Number of threads used to expand team submissions concurrently
+NO_EXTRACT_THREADS = min(32, 4 * (os.cpu_count() or 1))
+
 
 def list_partition(list_in, n):
     # partitions a list into n (nearly) equal lists: https://stackoverflow.com/questions/3352737/how-to-randomly-partition-a-list-into-n-nearly-equal-parts
@@ -25,6 +53,129 @@ def get_agent_factory(team_name):
     return os.path.join(TEAMS_SUBDIR, team_name, AGENT_FILE_NAME)
 
 
+def remove_tree_in_background(path):
+    """Removes a folder tree without waiting for it: the folder is first moved into TMP_DIR under a trash name (so
+    its path is free straight away) and then deleted by a background thread (not a daemon, so the program exits only
+    once it is done). The folder must be in the same file system as TMP_DIR.
+
+    Args:
+        path (str): folder to remove
+
+    Returns:
+        threading.Thread: the thread deleting the folder
+    """
+    if os.path.basename(path).startswith(TRASH_DIR_PREFIX):
+        trash_path = path
+    else:
+        trash_path = os.path.join(TMP_DIR, f"{TRASH_DIR_PREFIX}{os.path.basename(path)}-{os.urandom(4).hex()}")
+        os.rename(path, trash_path)
+    remover = threading.Thread(target=shutil.rmtree, args=(trash_path,), kwargs={"ignore_errors": True})
+    remover.start()
+    return remover
+
+
+def zip_entry_name(info):
+    """Returns the (relative) path where a zip file entry is to be placed, or None if it would fall outside
+    the destination (same treatment as extractall(): no absolute paths or paths outside the destination)"""
+    name = os.path.normpath(info.filename).lstrip("/")
+    return None if name.startswith("..") else name
+
+
+def extract_zip(zip_file, destination):
+    """Expands all the files in an open zip file into folder destination
+
+    Same as zip_file.extractall(destination) but copying the contents with COPY_BUFSIZE buffers, much larger
+    than the ones used by extractall(), and creating each folder just once.
+
+    Args:
+        zip_file (zipfile.ZipFile): zip file to expand
+        destination (str): folder where to expand the files
+    """
+    dirs_created = set()
+    for info in zip_file.infolist():
+        name = zip_entry_name(info)
+        if name is None:
+            continue
+        target = os.path.join(destination, name)
+        target_dir = target if info.is_dir() else os.path.dirname(target)
+        if target_dir not in dirs_created:
+            os.makedirs(target_dir, exist_ok=True)
+            dirs_created.add(target_dir)
+        if info.is_dir():
+            continue
+
+        with zip_file.open(info) as f_src, open(target, "wb") as f_dst:
+            shutil.copyfileobj(f_src, f_dst, COPY_BUFSIZE)
+
+
+def copy_zip_entries(src_zip, dst_zip, prefix="", skip=set()):
+    """Copies all the files and folders in zip file src_zip into the open (for writing) zip file dst_zip
+
+    Args:
+        src_zip (str): zip file to copy the files from
+        dst_zip (zipfile.ZipFile): zip file to copy the files into
+        prefix (str, optional): folder inside dst_zip where to place the files. Defaults to "" (root).
+        skip (set(str), optional): names in dst_zip that must not be written (e.g., already there). Defaults to set().
+
+    Returns:
+        [set(str)]: the names written into dst_zip
+    """
+    written = set()
+    with zipfile.ZipFile(src_zip) as src:
+        for info in src.infolist():
+            name = zip_entry_name(info)
+            if name is None or name == ".":
+                continue
+            name = os.path.join(prefix, name) + ("/" if info.is_dir() else "")
+            if name in skip or name in written:
+                continue
+
+            dst_info = zipfile.ZipInfo(name, date_time=info.date_time)
+            # keep the system the attributes come from, so unzip does not read DOS attributes as a Unix mode
+            dst_info.create_system = info.create_system
+            dst_info.external_attr = info.external_attr
+            dst_info.compress_type = dst_zip.compression
+            if info.is_dir():  # kept, so empty folders are in dst_zip too
+                dst_zip.writestr(dst_info, b"")
+            else:
+                with src.open(info) as f_src, dst_zip.open(dst_info, "w") as f_dst:
+                    shutil.copyfileobj(f_src, f_dst, COPY_BUFSIZE)
+            written.add(name)
+    return written
+
+
+def iter_dir_files(src_dir, ignore=None, include_dirs=False):
+    """Yields the path of all the files in folder src_dir (recursively)
+
+    Args:
+        src_dir (str): folder to list the files of
+        ignore (callable, optional): as in shutil.copytree(), returns names to ignore in a folder. Defaults to None.
+        include_dirs (bool, optional): if True, the sub-folders are yielded too (before their files). Defaults to False.
+    """
+    for root, dirs, files in os.walk(src_dir):
+        ignored = ignore(root, dirs + files) if ignore is not None else set()
+        dirs[:] = [d for d in dirs if d not in ignored]
+        if include_dirs:
+            for dir_name in dirs:
+                yield os.path.join(root, dir_name)
+        for file_name in files:
+            if file_name not in ignored:
+                yield os.path.join(root, file_name)
+
+
+def copy_dir_entries(src_dir, dst_zip, prefix="", ignore=None):
+    """Copies all the files and sub-folders in folder src_dir into the open (for writing) zip file dst_zip
+
+    Args:
+        src_dir (str): folder to copy the files from
+        dst_zip (zipfile.ZipFile): zip file to copy the files into
+        prefix (str, optional): folder inside dst_zip where to place the files. Defaults to "" (root).
+        ignore (callable, optional): as in shutil.copytree(), returns names to ignore in a folder. Defaults to None.
+    """
+    for file_path in iter_dir_files(src_dir, ignore, include_dirs=True):
+        dst_zip.write(file_path, os.path.join(prefix, os.path.relpath(file_path, src_dir)))
+
+
 class MultiContest:
     def __init__(self, settings):
         self.layouts = set()
@@ -58,15 +209,15 @@ class MultiContest:
         # Report layouts to be played, fixed and random (with seeds)
         self.log_layouts()
 
-        # clear out old contest subdirectories
+        # clear out old contest subdirectories (and any left by an interrupted removal)
+        #   they are moved out of the way at once, and deleted in the background while the contest is set up
         for contest_folder in os.listdir(TMP_DIR):
             contest_path = os.path.join(TMP_DIR, contest_folder)
-            if (
-                os.path.isdir(contest_path)
-                and contest_folder.startswith("contest-")
-                and contest_folder != "contest-run"
+            if os.path.isdir(contest_path) and (
+                (contest_folder.startswith("contest-") and contest_folder != "contest-run")
+                or contest_folder.startswith(TRASH_DIR_PREFIX)
             ):
-                shutil.rmtree(contest_path)
+                remove_tree_in_background(contest_path)
 
         # unique id for this execution of the contest; used to label logs
         self.contest_timestamp_id = (
@@ -76,7 +227,7 @@ class MultiContest:
         # Setup all of the TEAMS
         teams_dir = os.path.join(self.tmp_contest_dir, TEAMS_SUBDIR)
         if os.path.exists(teams_dir):
-            shutil.rmtree(teams_dir)
+            remove_tree_in_background(teams_dir)
         os.makedirs(teams_dir)
 
         self.team_names = None
@@ -86,47 +237,113 @@ class MultiContest:
         self.teams = []
         self.staff_teams = []
         self.submission_times = {}
+        self.submission_paths = {}  # latest submission (zip file or folder) of each team
 
         # settings["teams_roots"] is a list of folders
         for team_root in settings["teams_roots"]:
-            for submission_file in os.listdir(team_root):
-                submission_path = os.path.join(
-                    team_root, submission_file)
-                if submission_file.endswith(".zip") or os.path.isdir(submission_path):
-                    self._setup_team(
-                        submission_path,
-                        teams_dir,
-                        ignore_file_name_format=settings["ignore_file_name_format"],
-                        is_staff_team=False
-                    )
+            with os.scandir(team_root) as entries:
+                for submission_entry in entries:
+                    if submission_entry.name.endswith(".zip") or submission_entry.is_dir():
+                        self._setup_team(
+                            submission_entry,
+                            ignore_file_name_format=settings["ignore_file_name_format"],
+                            is_staff_team=False
+                        )
 
         # Include staff teams if available (ones with pattern STAFF_TEAM_FILENAME_PATTERN)
         if settings["include_staff_team"]:
             for staff_teams_root in settings["staff_teams_roots"]:
-                for staff_team_path in os.listdir(staff_teams_root):
-                    match = re.match(
-                        STAFF_TEAM_FILENAME_PATTERN,
-                        os.path.basename(staff_team_path),
-                    )
-                    if match:
-                        submission_path = os.path.join(
-                            staff_teams_root, staff_team_path
-                        )
-                        if staff_team_path.endswith(".zip") or os.path.isdir(
-                            submission_path
+                with os.scandir(staff_teams_root) as entries:
+                    for submission_entry in entries:
+                        if STAFF_TEAM_FILENAME_PATTERN.match(submission_entry.name) and (
+                            submission_entry.name.endswith(".zip") or submission_entry.is_dir()
                         ):
                             self._setup_team(
-                                submission_path, teams_dir, 
+                                submission_entry,
                                 ignore_file_name_format=True,
                                 is_staff_team=True)
 
-        # zip directory for transfer to remote workers; zip goes into temp directory
-        shutil.make_archive(
-            os.path.join(TMP_DIR, CORE_CONTEST_TEAM_ZIP_FILE[:-4]),
-            "zip",
-            self.tmp_contest_dir,
+        # expand the latest submission of each team into its own directory inside the contest folder
+        #   (each team is independent I/O bound work, so expand them concurrently; no more threads than teams)
+        Parallel(max(1, min(NO_EXTRACT_THREADS, len(self.submission_paths))), backend="threading")(
+            delayed(self._extract_team)(submission_path, os.path.join(teams_dir, team_name))
+            for team_name, submission_path in self.submission_paths.items()
+        )
+
+        # zip for transfer to remote workers; zip goes into temp directory
+        self._build_core_package(
+            os.path.join(TMP_DIR, CORE_CONTEST_TEAM_ZIP_FILE),
+            os.path.join(DIR_SCRIPT, CONTEST_ZIP_FILE),
+            settings["fixed_layouts_file"],
+            settings["core_package_compression"],
         )
 
+    def _build_core_package(self, core_zip_file_path, contest_zip_file_path, layouts_zip_file_path, compression):
+        """Builds the zip file with the contest platform and all the teams to be transferred to the hosts.
+
+        The zip has the same structure as the contest folder (platform in the root, layouts in layouts/ and
+        each team in teams/<team_name>/), but the files are copied straight from the contest and layouts zip
+        files and the teams' submissions, rather than compressing the expanded contest folder all over again.
+
+        :param core_zip_file_path: the zip file to build.
+        :param contest_zip_file_path: the zip file containing the necessary files for the contest (no sub-folder).
+        :param layouts_zip_file_path: the zip file containing the layouts to be used for the contest (in the root).
+        :param compression: the compression method of the zip, one of CORE_PACKAGE_COMPRESSIONS.
+        """
+        # the zip is only re-built if any of its inputs has changed since it was last built
+        #   the hash of the inputs it was built from is kept next to it
+        inputs_hash = self._core_package_inputs_hash(contest_zip_file_path, layouts_zip_file_path, compression)
+        inputs_hash_file_path = f"{core_zip_file_path}.hash"
+        if os.path.exists(core_zip_file_path) and os.path.exists(inputs_hash_file_path):
+            with open(inputs_hash_file_path, "r") as f:
+                if f.read() == inputs_hash:
+                    logging.info(f"Contest and teams unchanged since last run, re-using {core_zip_file_path}")
+                    return
+            os.remove(inputs_hash_file_path)
+
+        with zipfile.ZipFile(core_zip_file_path, "w", CORE_PACKAGE_COMPRESSIONS[compression]) as core_zip:
+            # layouts first, as they overwrite the ones in the contest zip file when expanded
+            layout_names = copy_zip_entries(layouts_zip_file_path, core_zip, prefix="layouts")
+            copy_zip_entries(contest_zip_file_path, core_zip, skip=layout_names)
+
+            for team_name, submission_path in self.submission_paths.items():
+                team_dir = os.path.join(TEAMS_SUBDIR, team_name)
+                if os.path.isdir(submission_path):
+                    copy_dir_entries(submission_path, core_zip, prefix=team_dir, ignore=TEAM_IGNORE_PATTERNS)
+                else:
+                    copy_zip_entries(submission_path, core_zip, prefix=team_dir)
+
+        with open(inputs_hash_file_path, "w") as f:
+            f.write(inputs_hash)
+
+    def _core_package_inputs_hash(self, contest_zip_file_path, layouts_zip_file_path, compression):
+        """Hash identifying all the inputs of the core package zip file: the contest and layouts zip files, and
+        the latest submission of each team (name, modification time and size of every file), its compression, and the
+        version of the packaging logic (CORE_PACKAGE_FORMAT_VERSION)
+
+        :param contest_zip_file_path: the zip file containing the necessary files for the contest (no sub-folder).
+        :param layouts_zip_file_path: the zip file containing the layouts to be used for the contest (in the root).
+        :param compression: the compression method of the zip, one of CORE_PACKAGE_COMPRESSIONS.
+        :returns: the hash as an hex string
+        """
+        inputs_hash = hashlib.blake2b(repr((CORE_PACKAGE_FORMAT_VERSION, compression)).encode())
+
+        def add_file(file_path, name):
+            file_stat = os.stat(file_path)
+            inputs_hash.update(repr((name, file_stat.st_mtime_ns, file_stat.st_size)).encode())
+
+        add_file(contest_zip_file_path, os.path.abspath(contest_zip_file_path))
+        add_file(layouts_zip_file_path, os.path.abspath(layouts_zip_file_path))
+        for team_name, submission_path in sorted(self.submission_paths.items()):
+            team_dir = os.path.join(TEAMS_SUBDIR, team_name)
+            if os.path.isdir(submission_path):
+                for file_path in sorted(iter_dir_files(submission_path, TEAM_IGNORE_PATTERNS, include_dirs=True)):
+                    add_file(file_path, (team_dir, os.path.relpath(file_path, submission_path)))
+            else:
+                add_file(submission_path, (team_dir, os.path.abspath(submission_path)))
+
+        return inputs_hash.hexdigest()
+
     def create_contests(self):
         """Builds a list of ContestRunner objects, one per split contest
 
@@ -146,9 +363,9 @@ class MultiContest:
 
         ## Dump config file for the whole multi-contest
         with open(os.path.join(TMP_DIR, DEFAULT_CONFIG_FILE), "w") as f:
-            json.dump(
-                self.settings, f, sort_keys=True, indent=4, separators=(",", ": ")
-            )
+            f.write(json.dumps(
+                self.settings, sort_keys=True, indent=4, separators=(",", ": ")
+            ))
 
         self.settings["layouts"] = list(self.layouts)
         self.settings["staff_teams"] = [
@@ -194,7 +411,8 @@ class MultiContest:
         random_seeds=[],
     ):
         """
-        Cleans the given destination directory and prepares a fresh setup to execute a Pacman CTF game within.
+        Cleans the given destination directory and prepares a fresh setup to execute a Pacman CTF game within
+        (unless it already holds the setup expanded from the same zip files, which is then re-used).
         Information on the layouts are saved in the member variable layouts.
 
         :param contest_zip_file_path: the zip file containing the necessary files for the contest (no sub-folder).
@@ -202,19 +420,43 @@ class MultiContest:
         :param destination: the directory in which to setup the environment.
         :returns: a list of all the layouts
         """
-        if os.path.exists(destination):
-            shutil.rmtree(destination)
-        os.makedirs(destination)
-        contest_zip_file = zipfile.ZipFile(contest_zip_file_path)
-        contest_zip_file.extractall(os.path.join(destination, "."))
-        layouts_zip_file = zipfile.ZipFile(layouts_zip_file_path)
-        layouts_zip_file.extractall(os.path.join(destination, "layouts"))
-
-        # Pick no_fixed_layouts layouts from the given set in the layout zip file
-        #   if layout seeds have been given use them
-        layouts_available = set(
-            [file_in_zip[:-4] for file_in_zip in layouts_zip_file.namelist()]
-        )
+        # the platform is only expanded again if the contest or layouts zip files have changed since it was last
+        #   expanded into destination (the hash of the zip files it was expanded from is kept inside it)
+        platform_hash = hashlib.blake2b()
+        for zip_file_path in (contest_zip_file_path, layouts_zip_file_path):
+            file_stat = os.stat(zip_file_path)
+            platform_hash.update(
+                repr((os.path.abspath(zip_file_path), file_stat.st_mtime_ns, file_stat.st_size)).encode())
+        platform_hash = platform_hash.hexdigest()
+        platform_hash_file_path = os.path.join(destination, PLATFORM_HASH_FILE)
+
+        try:
+            with open(platform_hash_file_path, "r") as f:
+                platform_unchanged = f.read() == platform_hash
+        except FileNotFoundError:
+            platform_unchanged = False
+
+        with zipfile.ZipFile(layouts_zip_file_path) as layouts_zip_file:
+            if platform_unchanged:
+                logging.info(f"Contest and layouts zip files unchanged since last run, re-using {destination}")
+            else:
+                if os.path.exists(destination):
+                    shutil.rmtree(destination)
+                os.makedirs(destination)
+                with zipfile.ZipFile(contest_zip_file_path) as contest_zip_file:
+                    extract_zip(contest_zip_file, destination)
+                extract_zip(layouts_zip_file, os.path.join(destination, "layouts"))
+                with open(platform_hash_file_path, "w") as f:
+                    f.write(platform_hash)
+
+            # Pick no_fixed_layouts layouts from the given set in the layout zip file (only its .lay files)
+            #   if layout seeds have been given use them
+            layouts_available = set(
+                os.path.splitext(file_in_zip)[0]
+                for file_in_zip in layouts_zip_file.namelist()
+                if file_in_zip.endswith(LAYOUT_FILE_EXTENSION)
+            )
+
         fixed_layout_seeds = set(fixed_layout_seeds)
         random_seeds = set(random_seeds)
 
@@ -238,7 +480,7 @@ class MultiContest:
         # assign the set of fixed layouts to be used: the seeds given and complete with random picks from available
         self.layouts = fixed_layout_seeds.union(
             random.sample(
-                layouts_available.difference(fixed_layout_seeds),
+                sorted(layouts_available.difference(fixed_layout_seeds)),
                 no_fixed_layouts - len(fixed_layout_seeds),
             )
         )
@@ -259,7 +501,7 @@ class MultiContest:
     def log_layouts(self):
         logging.info("Layouts to be played: %s" % self.layouts)
         random_layouts_selected = set(
-            [x for x in self.layouts if re.compile(r"RANDOM[0-9]*").match(x)]
+            [x for x in self.layouts if RANDOM_LAYOUT_PATTERN.match(x)]
         )
         fixed_layouts_selected = self.layouts.difference(
             random_layouts_selected)
@@ -267,7 +509,7 @@ class MultiContest:
         seeds_strings = [
             m.group(1)
             for m in (
-                re.compile(r"RANDOM([0-9]*)").search(layout)
+                RANDOM_LAYOUT_PATTERN.match(layout)
                 for layout in random_layouts_selected
             )
             if m
@@ -280,33 +522,28 @@ class MultiContest:
 
     def _setup_team(
         self,
-        submission_path,
-        destination,
+        submission_entry,
         ignore_file_name_format=True,
         is_staff_team=False,
     ):
         """
-        Extracts team.py from the team submission zip file into a directory inside contest/teams
-            If the zip file name is listed in team-name mapping, then name directory with team name
-            otherwise name directory after the zip file.
-        Information on the teams are saved in the member variable teams.
+        Registers a team submission (zip file or folder), keeping only the latest submission of each team.
+            The team name is extracted from the submission name, or is the submission name itself.
+        Information on the teams are saved in the member variables teams/staff_teams, and the latest submission of
+        each team in submission_paths (to be expanded by _extract_team() once all submissions have been registered).
 
-        :param submission_path: the zip file or directory of the team.
-        :param destination: the directory where the team directory is to be created and files copied.
+        :param submission_entry: the os.DirEntry of the zip file or directory of the team.
         :param ignore_file_name_format: if True, an invalid file name format does not cause the team to be ignored.
         In this case, if the file name truly is not respecting the format, the zip file name (minus the .zip part) is
         used as team name. If this function is called twice with files having the same name (e.g., if they are in
-        different directories), only the first one is kept.
-        :param allow_non_registered_students: if True, students not appearing in the team_names are still allowed (team
-        name used is the student id).
-        :raises KeyError if the zip file contains multiple copies of team.py, non of which is in the root.
+        different directories), only the first one is kept. Otherwise, a submission whose name carries no date is
+        timed by its modification time.
+        :param is_staff_team: if True, the team is registered as a staff team.
         """
-        # NOTE: this is duplicated in ContestRunner._setup_team. Should be abstracted
-        if os.path.isdir(submission_path):
-            submission_zip_file = None
-        else:
+        submission_path = submission_entry.path
+        if not submission_entry.is_dir():
             try:
-                submission_zip_file = zipfile.ZipFile(submission_path)
+                zipfile.ZipFile(submission_path).close()
             except zipfile.BadZipfile:
                 logging.warning(
                     f"Submission is not a valid ZIP file nor a folder: {submission_path}. Skipping"
@@ -314,53 +551,58 @@ class MultiContest:
                 return
 
         if ignore_file_name_format: # use exact name of file as team name
-            team_name = os.path.basename(submission_path)
+            team_name = submission_entry.name
             team_name = team_name[:-
                                   4] if team_name.endswith(".zip") else team_name
             submission_time = None
         else:
             # Set team name from submission file name - extract given pattern
-            match = re.match(SUBMISSION_FILENAME_PATTERN,
-                            os.path.basename(submission_path))
-            submission_time = None
-            if match:
-                team_name = match.group(1)
+            match = SUBMISSION_FILENAME_PATTERN.match(submission_entry.name)
+            if not match:
+                logging.warning(
+                    f'Team zip file "{submission_path}" name does not follow the submission format. Skipping'
+                )
+                return
+            team_name = match.group(1)
 
-                # next get the submission date (encoded in filename)
+            # next get the submission date (encoded in filename, else from the cached stat of the entry)
+            if match.group(3) is None:
+                submission_time = datetime.datetime.fromtimestamp(submission_entry.stat().st_mtime, TIMEZONE)
+            else:
                 try:
                     submission_time = iso8601.parse_date(match.group(3)).astimezone(
                         TIMEZONE
                     )
                 except iso8601.iso8601.ParseError:
-                    if not ignore_file_name_format:
-                        logging.warning(
-                            f'Team zip file "{submission_path}" name has invalid date format. Skipping'
-                        )
-                        return
-
-        # This submission will be temporarily expanded into team_destination_dir
-        team_destination_dir = os.path.join(destination, team_name)
+                    logging.warning(
+                        f'Team zip file "{submission_path}" name has invalid date format. Skipping'
+                    )
+                    return
 
         if team_name not in self.submission_times:
-            if submission_zip_file is None:
-                shutil.copytree(submission_path, team_destination_dir, ignore=shutil.ignore_patterns(
-                    '.git', '*.log', '*.replay', '*.gz', '*img*', '*layouts*', '*wiki*'))
-            else:
-                submission_zip_file.extractall(team_destination_dir)
             if is_staff_team:
                 self.staff_teams.append(team_name)
             else:
                 self.teams.append(team_name)
-            self.submission_times[team_name] = submission_time
-
         elif (
-            submission_time is not None
-            and self.submission_times[team_name] < submission_time
+            submission_time is None
+            or self.submission_times[team_name] is None
+            or self.submission_times[team_name] >= submission_time
         ):
-            shutil.rmtree(team_destination_dir)
-            if submission_zip_file is None:
-                shutil.copy(submission_path, team_destination_dir, ignore=shutil.ignore_patterns(
-                    '.git', '*.log', '*.replay', '*.gz', '*img*', '*layouts*', '*wiki*'))
-            else:
-                submission_zip_file.extractall(team_destination_dir)
-            self.submission_times[team_name] = submission_time
\ No newline at end of file
+            return  # an equally recent or later submission of the team has been registered already
+
+        self.submission_times[team_name] = submission_time
+        self.submission_paths[team_name] = submission_path
+
+    def _extract_team(self, submission_path, team_destination_dir):
+        """
+        Expands a team submission (zip file or folder) into team_destination_dir
+
+        :param submission_path: the zip file or directory of the team.
+        :param team_destination_dir: the directory where the team files are to be copied.
+        """
+        if os.path.isdir(submission_path):
+            shutil.copytree(submission_path, team_destination_dir, ignore=TEAM_IGNORE_PATTERNS)
+        else:
+            with zipfile.ZipFile(submission_path) as submission_zip_file:
+                extract_zip(submission_zip_file, team_destination_dir)
@@ -51,6 +51,29 @@ def default(str):
     return str + " [Default: %default]"
 
 
+def write_json_file(file_path, data):
+    """Dumps data into a JSON file, unless the file already has exactly that content (so it is left untouched)
+
+    Args:
+        file_path (str): the JSON file to write
+        data (dict): the data to dump
+
+    Returns:
+        [bool]: True if the file was (re-)written
+    """
+    content = json.dumps(data, sort_keys=True, indent=4, separators=(",", ": "))
+    try:
+        with open(file_path, "r") as f:
+            if f.read() == content:
+                return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+
+    with open(file_path, "w") as f:
+        f.write(content)
+    return True
+
+
 def load_settings():
 
     parser = argparse.ArgumentParser(
@@ -120,6 +143,9 @@ def load_settings():
     parser.add_argument("--split",
                         help=f"split contest into n leagues (default: {DEFAULT_NO_SPLIT}).",
                         type=int)
+    parser.add_argument("--core-package-compression",
+                        choices=sorted(CORE_PACKAGE_COMPRESSIONS),
+                        help=f"compression of the zip with the contest and teams transferred to the hosts (default: {DEFAULT_CORE_PACKAGE_COMPRESSION}).")
     parser.add_argument("--hide-staff-teams",
                         help="if set to true, it will hide the staff teams from the final leaderboard table. ",
                         action="store_true")
@@ -143,6 +169,7 @@ def load_settings():
     settings_default["no_random_layouts"] = DEFAULT_RANDOM_LAYOUTS
     settings_default["max_steps"] = DEFAULT_MAX_STEPS
     settings_default["split"] = DEFAULT_NO_SPLIT
+    settings_default["core_package_compression"] = DEFAULT_CORE_PACKAGE_COMPRESSION
     settings_default["fixed_layouts_file"] = DEFAULT_LAYOUTS_ZIP_FILE
     settings_default["resume_contest_folder"] = None
     settings_default["include_staff_team"] = False
@@ -209,7 +236,8 @@ def load_settings():
 
 
     # Check if some important option is missing, if so abort (not used yet)
-    missing_parameters = set({}) - set(settings.keys())
+    required_parameters = ()
+    missing_parameters = [k for k in required_parameters if k not in settings]
     if missing_parameters:
         logging.error(
             "Missing parameters: %s. Aborting." % list(sorted(missing_parameters))
@@ -217,14 +245,23 @@ def load_settings():
         parser.print_help()
         sys.exit(1)
 
+    # Check the options with a fixed set of values (these may also come from a JSON config file, not checked by argparse)
+    if settings["core_package_compression"] not in CORE_PACKAGE_COMPRESSIONS:
+        logging.error(
+            f"Invalid core package compression {settings['core_package_compression']}; "
+            f"must be one of {sorted(CORE_PACKAGE_COMPRESSIONS)}. Aborting."
+        )
+        sys.exit(1)
+
     # Dump current config files into configuration file if requested
     # this config file only contains the CLI options given, it will not include for example the random layouts chosen
     # this config is useful to re-run the same type of contest over and over, but not to reproduce an exact contest
     # as it may miss information like which particular layouts have been chosen randomly
     if args['build_config_file']:
-        logging.info(f"Dumping current options to file {args['build_config_file']}")
-        with open(args['build_config_file'], "w") as f:
-            json.dump(settings, f, sort_keys=True, indent=4, separators=(",", ": "))
+        if write_json_file(args['build_config_file'], settings):
+            logging.info(f"Dumping current options to file {args['build_config_file']}")
+        else:
+            logging.info(f"Options unchanged in file {args['build_config_file']}, not re-writing it")
 
 
     return settings
@@ -28,6 +28,11 @@ DIR_SCRIPT = sys.path[0]
 FILE_FONTS = os.path.join(DIR_SCRIPT, "fonts.zip")
 FILE_CSS = os.path.join(DIR_SCRIPT, "style.css")
 
+# One row of the standings table and of the games table in the report of a run (see HtmlGenerator._generate_output())
+TEAM_ROW_HTML = ("""<tr><td>%d</td><td>%s</td><td>%d%%</td><td>%d</td><td>%d</td><td >%d</td><td>%d</td>"""
+                 """<td>%d</td><td >%d</td><td >%d</td></tr>\n""")
+GAME_ROW_HTML = """<tr><td align="center">%s</td><td align="center">%s</td><td>%s</td><td>%s</td>%s</tr>\n"""
+
 # ----------------------------------------------------------------------------------------------------------------------
 # Load settings either from config.json or from the command line
 
@@ -69,7 +74,7 @@ def load_settings():
         settings['www_dir'] = args.www_dir
 
     # Check mandatory parameters are there, otherwise quit
-    missing_parameters = {'organizer', 'www_dir'} - set(settings.keys())
+    missing_parameters = [k for k in ('organizer', 'www_dir') if k not in settings]
     if missing_parameters:
         logging.error(f'Missing parameters: {list(sorted(missing_parameters))}. Aborting.')
         parser.print_help()
@@ -162,11 +167,11 @@ class HtmlGenerator:
         team_stats = data['team_stats']
         random_layouts = data['random_layouts']
         fixed_layouts = data['fixed_layouts']
-        if 'organizer' in data.keys():
+        if 'organizer' in data:
             organizer = data['organizer']
         else:
             organizer = None
-        if 'timestamp_id' in data.keys():
+        if 'timestamp_id' in data:
             date_run = data['timestamp_id']
         else:
             date_run = run_id
@@ -189,7 +194,8 @@ class HtmlGenerator:
 
         html_full_path = os.path.join(self.www_dir, f'results_{run_id}.html')
         with open(html_full_path, "w") as f:
-            print(run_html, file=f)
+            f.write(run_html)
+            f.write("\n")
 
     def _generate_main_html(self):
         """
@@ -197,19 +203,18 @@ class HtmlGenerator:
         The file is saved in www/results.html.
         """
         # regenerate main html
-        main_html = """<html><head><title>Results for PACMAN Capture the Flag the tournament</title>\n"""
-        main_html += """<link rel="stylesheet" type="text/css" href="style.css"/></head>\n"""
-        main_html += """<body><h1>Results Pacman Capture the Flag by Date</h1>\n"""
-        main_html += """<body><h2>Organizer: %s </h1>\n\n""" % self.organizer
-        for d in sorted(os.listdir(self.www_dir)):
-            if d.endswith('fonts'):
-                continue
-            if not d.startswith('results'):
-                continue
-            main_html += f"""<a href="{d}"> {d[:-5]}  </a> <br/>\n"""
-        main_html += "\n\n<br/></body></html>"
+        main_html = ["""<html><head><title>Results for PACMAN Capture the Flag the tournament</title>\n"""]
+        main_html.append("""<link rel="stylesheet" type="text/css" href="style.css"/></head>\n""")
+        main_html.append("""<body><h1>Results Pacman Capture the Flag by Date</h1>\n""")
+        main_html.append("""<body><h2>Organizer: %s </h1>\n\n""" % self.organizer)
+        # only the run result pages (www/results_<run_id>.html), listing the WWW folder once without recursing
+        with os.scandir(self.www_dir) as entries:
+            results_files = sorted(e.name for e in entries if e.name.startswith('results') and e.is_file())
+        for d in results_files:
+            main_html.append(f"""<a href="{d}"> {d[:-5]}  </a> <br/>\n""")
+        main_html.append("\n\n<br/></body></html>\n")
         with open(os.path.join(self.www_dir, 'index.html'), "w") as f:
-            print(main_html, file=f)
+            f.write("".join(main_html))
 
     def _generate_output(self, run_id, date_run, organizer, games, team_stats, random_layouts, fixed_layouts, max_steps,
                          stats_dir, replays_dir, logs_dir):
@@ -220,17 +225,17 @@ class HtmlGenerator:
         if organizer is None:
             organizer = self.organizer
 
-        output = """<html><head><title>Results for the tournament round</title>\n"""
-        output += """<link rel="stylesheet" type="text/css" href="style.css"/></head>\n"""
-        output += """<body><h1>PACMAN Capture the Flag Tournament</h1>\n"""
-        output += """<body><h2>Tournament Organizer: %s </h1>\n""" % organizer
+        output = ["""<html><head><title>Results for the tournament round</title>\n"""]
+        output.append("""<link rel="stylesheet" type="text/css" href="style.css"/></head>\n""")
+        output.append("""<body><h1>PACMAN Capture the Flag Tournament</h1>\n""")
+        output.append("""<body><h2>Tournament Organizer: %s </h1>\n""" % organizer)
         if not run_id == date_run:
-            output += """<body><h2>Name of Tournament: %s </h1>\n""" % run_id
-        output += """<body><h2>Date of Tournament: %s \n</h1>""" % date_run
+            output.append("""<body><h2>Name of Tournament: %s </h1>\n""" % run_id)
+        output.append("""<body><h2>Date of Tournament: %s \n</h1>""" % date_run)
 
-        output += """<h2>Configuration: %d teams in %d (%d fixed + %d random) layouts for %d steps</h2>\n""" \
-                  % (len(team_stats), len(fixed_layouts) + len(random_layouts), len(fixed_layouts), len(random_layouts),
-                     max_steps)
+        output.append("""<h2>Configuration: %d teams in %d (%d fixed + %d random) layouts for %d steps</h2>\n"""
+                      % (len(team_stats), len(fixed_layouts) + len(random_layouts), len(fixed_layouts),
+                         len(random_layouts), max_steps))
 
         # output += """<h2>Configuration:</h2><ul>"""
         # output += """<li>No. of teams: %d</li>""" % len(team_stats)
@@ -249,23 +254,23 @@ class HtmlGenerator:
         #     s = '</li><li>'.join(random_layouts)
         #     output += """<h3>Random layouts</h2><ul><li>%s</li></ul><br/>""" % s
 
-        output += """<br/><br/><table border="1">"""
+        output.append("""<br/><br/><table border="1">""")
         if len(games) == 0:
-            output += "No match was run."
+            output.append("No match was run.")
         else:
             # First, print a table with the final standing
-            output += """<tr>"""
-            output += """<th>Position</th>"""
-            output += """<th>Team</th>"""
-            output += """<th>Points %</th>"""
-            output += """<th>Points</th>"""
-            output += """<th>Win</th>"""
-            output += """<th>Tie</th>"""
-            output += """<th>Lost</th>"""
-            output += """<th>TOTAL</th>"""
-            output += """<th>FAILED</th>"""
-            output += """<th>Score Balance</th>"""
-            output += """</tr>\n"""
+            output.append("""<tr>""")
+            output.append("""<th>Position</th>""")
+            output.append("""<th>Team</th>""")
+            output.append("""<th>Points %</th>""")
+            output.append("""<th>Points</th>""")
+            output.append("""<th>Win</th>""")
+            output.append("""<th>Tie</th>""")
+            output.append("""<th>Lost</th>""")
+            output.append("""<th>TOTAL</th>""")
+            output.append("""<th>FAILED</th>""")
+            output.append("""<th>Score Balance</th>""")
+            output.append("""</tr>\n""")
 
             # If score thresholds exist for table, sort in reverse order and add -1 as terminal boundary
             if self.score_thresholds is None:
@@ -281,92 +286,56 @@ class HtmlGenerator:
             position = 0
             for key, (points_pct, points, wins, draws, losses, errors, sum_score) in sorted_team_stats:
                 while score_thresholds[next_threshold_index] > points_pct:
-                    output +="""<tr bgcolor="#D35400"><td colspan="10" style="text-align:center">%d%% </td></tr>\n""" % score_thresholds[next_threshold_index]
+                    output.append("""<tr bgcolor="#D35400"><td colspan="10" style="text-align:center">%d%% </td></tr>\n""" % score_thresholds[next_threshold_index])
                     next_threshold_index+=1
                 position += 1
-                output += """<tr>"""
-                output += """<td>%d</td>""" % position
-                output += """<td>%s</td>""" % key
-                output += """<td>%d%%</td>""" % points_pct
-                output += """<td>%d</td>""" % points
-                output += """<td>%d</td>""" % wins
-                output += """<td >%d</td>""" % draws
-                output += """<td>%d</td>""" % losses
-                output += """<td>%d</td>""" % (wins + draws + losses)
-                output += """<td >%d</td>""" % errors
-                output += """<td >%d</td>""" % sum_score
-                output += """</tr>\n"""
-            output += "</table>"
+                output.append(TEAM_ROW_HTML % (position, key, points_pct, points, wins, draws, losses,
+                                               wins + draws + losses, errors, sum_score))
+            output.append("</table>")
 
 
             # Second, print each game result
-            output += "\n\n<br/><br/><h2>Games</h2>\n"
+            output.append("\n\n<br/><br/><h2>Games</h2>\n")
 
             times_taken = [time_game for (_, _, _, _, _, time_game) in games]
-            output += """<h3>No. of games: %d / Avg. game length: %s / Max game length: %s</h3>\n""" \
-                      % (len(games), str(datetime.timedelta(seconds=round(sum(times_taken) / len(times_taken),0))),
-                         str(datetime.timedelta(seconds=max(times_taken))))
+            output.append("""<h3>No. of games: %d / Avg. game length: %s / Max game length: %s</h3>\n"""
+                          % (len(games), str(datetime.timedelta(seconds=round(sum(times_taken) / len(times_taken),0))),
+                             str(datetime.timedelta(seconds=max(times_taken)))))
 
             if replays_dir:
-                output += """<a href="%s">DOWNLOAD REPLAYS</a><br/>\n""" % replays_dir
+                output.append("""<a href="%s">DOWNLOAD REPLAYS</a><br/>\n""" % replays_dir)
             if logs_dir:
-                output += """<a href="%s">DOWNLOAD LOGS</a><br/>\n""" % logs_dir
+                output.append("""<a href="%s">DOWNLOAD LOGS</a><br/>\n""" % logs_dir)
             if stats_dir:
-                output += """<a href="%s">DOWNLOAD STATS</a><br/>\n\n""" % stats_dir
-            output += """<table border="1">"""
-            output += """<tr>"""
-            output += """<th>Team 1</th>"""
-            output += """<th>Team 2</th>"""
-            output += """<th>Layout</th>"""
-            output += """<th>Time</th>"""
-            output += """<th>Score</th>"""
-            output += """<th>Winner</th>"""
-            output += """</tr>\n"""
+                output.append("""<a href="%s">DOWNLOAD STATS</a><br/>\n\n""" % stats_dir)
+            output.append("""<table border="1">""")
+            output.append("""<tr>""")
+            output.append("""<th>Team 1</th>""")
+            output.append("""<th>Team 2</th>""")
+            output.append("""<th>Layout</th>""")
+            output.append("""<th>Time</th>""")
+            output.append("""<th>Score</th>""")
+            output.append("""<th>Winner</th>""")
+            output.append("""</tr>\n""")
             for (n1, n2, layout, score, winner, time_taken) in games:
-                output += """<tr>"""
-
-                # Team 1
-                output += """<td align="center">"""
-                if winner == n1:
-                    output += "<b>%s</b>" % n1
-                else:
-                    output += "%s" % n1
-                output += """</td>"""
-
-                # Team 2
-                output += """<td align="center">"""
-                if winner == n2:
-                    output += "<b>%s</b>" % n2
-                else:
-                    output += "%s" % n2
-                output += """</td>"""
-
-                # Layout
-                output += """<td>%s</td>""" % layout
-
-                # Time taken in the game
-                output += """<td>%s</td>""" % str(datetime.timedelta(seconds=time_taken))
-
                 # Score and Winner
                 if score == ERROR_SCORE:
                     if winner == n1:
-                        output += """<td >--</td>"""
-                        output += """<td><b>ONLY FAILED: %s</b></td>""" % n2
+                        result = """<td >--</td><td><b>ONLY FAILED: %s</b></td>""" % n2
                     elif winner == n2:
-                        output += """<td >--</td>"""
-                        output += """<td><b>ONLY FAILED: %s</b></td>""" % n1
+                        result = """<td >--</td><td><b>ONLY FAILED: %s</b></td>""" % n1
                     else:
-                        output += """<td >--</td>"""
-                        output += """<td><b>FAILED BOTH</b></td>"""
+                        result = """<td >--</td><td><b>FAILED BOTH</b></td>"""
                 else:
-                    output += """<td>%d</td>""" % score
-                    output += """<td><b>%s</b></td>""" % winner
+                    result = """<td>%d</td><td><b>%s</b></td>""" % (score, winner)
 
-                output += """</tr>\n"""
+                output.append(GAME_ROW_HTML % ("<b>%s</b>" % n1 if winner == n1 else n1,
+                                               "<b>%s</b>" % n2 if winner == n2 else n2,
+                                               layout, datetime.timedelta(seconds=time_taken), result))
 
-        output += "\n\n</table></body></html>"
+        output.append("\n\n</table></body></html>")
 
-        return output
+        return "".join(output)
 
 
 if __name__ == '__main__':
@@ -381,8 +350,9 @@ if __name__ == '__main__':
     if stats_dir is not None:
         pattern = re.compile(r'stats_([-+0-9T:.]+)\.json')
 
-        # Collect all files in stats directory
-        all_files = [f for f in os.listdir(stats_dir) if os.path.isfile(os.path.join(stats_dir, f))]
+        # Collect all files in stats directory (one listing, sorted by run id for a deterministic order)
+        with os.scandir(stats_dir) as entries:
+            all_files = sorted(e.name for e in entries if e.is_file())
 
         # make paths relative to www_dir
         www_dir = settings['www_dir']